@@ -3,18 +3,35 @@ Book Price Tracker - Flask Web Application
 Main entry point for the web interface
 """
 
-from flask import Flask, render_template, jsonify, request, make_response
+from flask import Flask, render_template, stream_template, jsonify, request, Response
+from flask.json.provider import DefaultJSONProvider
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import logging
+import os
 from pathlib import Path
 import json
-import html
-import io
+import orjson
+import shutil
+import tempfile
 import asyncio
-from threading import Lock
+from threading import Lock, local
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
 import traceback
 
+from scripts.google_books_api import GoogleBooksAPI
+from scripts.image_downloader import (
+    cleanup_old_images,
+    download_all_book_icons,
+    download_googlebooks_icon,
+    download_image_for_isbn_source,
+    get_existing_image_info,
+)
+from scripts.scraper import load_isbns_from_file, save_results_to_csv, scrape_all_isbns, scrape_all_sources
+
 # Import visualization module
 try:
     from visualization import generate_dashboard_charts
@@ -23,14 +40,58 @@ except ImportError:
     CHARTS_AVAILABLE = False
     logging.warning("Visualization module not available - charts will be disabled")
 
+# Import Numba kernels (optional)
+try:
+    from kernels import latest_per_group
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson
+
+    Keys are sorted like Flask's default provider. NumPy scalars and arrays
+    serialize natively; datetimes and other unsupported types fall back to
+    Flask's default conversion.
+    """
+
+    option = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.option | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype
+        )
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config["SECRET_KEY"] = "book-price-tracker-secret-key"
 
 # Setup paths
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 PRICES_CSV = DATA_DIR / "prices.csv"
+CSV_EXPORT_CHUNK_ROWS = 10000
+# Dashes and spaces stripped from user-entered ISBNs
+ISBN_SEPARATORS = str.maketrans("", "", "- ")
+PRICES_TEXT_DTYPES = {column: str for column in ("timestamp", "isbn", "book_title", "title", "source", "url", "notes")}
 LOGS_DIR = BASE_DIR / "logs"
 GRADES_FILE = DATA_DIR / "grades.json"
 
@@ -48,23 +109,216 @@ logger = logging.getLogger(__name__)
 
 grade_db_lock = Lock()
 
+# Serializes prices.csv parsing so concurrent requests after a scrape share one parse
+prices_load_lock = Lock()
 
-def load_prices_data():
-    """Load prices data from CSV file"""
+
+class _VersionedCache:
+    """Single-entry cache for data derived from loaded files
+
+    Entries are keyed on the version token returned with the loaded data (the
+    files' (mtime_ns, size)) rather than on the loaded object, so a reload never
+    keeps the previous data alive.
+    """
+
+    _EMPTY = object()
+
+    def __init__(self):
+        self._entry = (self._EMPTY, None)
+
+    def get(self, version, build):
+        """Return the value built for version, calling build() when the version changed"""
+        cached_version, value = self._entry
+        if cached_version != version:
+            value = build()
+            self._entry = (version, value)
+        return value
+
+    def clear(self):
+        self._entry = (self._EMPTY, None)
+
+
+# Values derived from prices.csv, books.json and grades.json, rebuilt when those change
+_CHARTS_CACHE = _VersionedCache()
+_ISBN_ROWS_CACHE = _VersionedCache()
+_ISBN_TITLE_CACHE = _VersionedCache()
+_BOOK_ISBNS_CACHE = _VersionedCache()
+_BOOK_GRADES_CACHE = _VersionedCache()
+_DASHBOARD_CACHE = _VersionedCache()
+
+# Google Books clients, one per thread because requests.Session is not thread-safe
+_GOOGLE_BOOKS_CLIENTS = local()
+
+
+@lru_cache(maxsize=1)
+def _load_prices_cached(mtime_ns, size):
+    """Parse prices.csv once per modification time and size"""
+    # Load text columns as strings (keeping ISBNs from integer conversion) so
+    # only price and success go through type inference
+    df = pd.read_csv(PRICES_CSV, dtype=PRICES_TEXT_DTYPES, keep_default_na=False, na_values=[""])
+    # Parse prices once here so routes don't re-coerce the column per request
+    df["price"] = pd.to_numeric(df["price"], errors="coerce")
+    # Normalize success to a real boolean column (blank, unknown or missing values count as failures)
+    if "success" in df.columns:
+        df["success"] = df["success"].isin([True, "True"])
+    else:
+        df["success"] = False
+    logger.info(f"Loaded {len(df)} price records from CSV")
+    return df
+
+
+def _file_version(path):
+    """Return the (mtime_ns, size) version token of path, or None if it does not exist"""
     try:
-        if PRICES_CSV.exists():
-            # Load with ISBN as string to avoid integer conversion
-            df = pd.read_csv(PRICES_CSV, dtype={'isbn': str}, keep_default_na=False, na_values=[""])
-            logger.info(f"Loaded {len(df)} price records from CSV")
-            return df
-        else:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def prices_snapshot():
+    """Load prices data from CSV file along with the version token it was loaded at
+
+    The parsed DataFrame is shared between requests until prices.csv changes,
+    so callers must treat it as read-only.
+    """
+    try:
+        version = _file_version(PRICES_CSV)
+        if version is None:
             logger.warning("prices.csv not found, creating empty DataFrame")
             # Create empty DataFrame with expected columns
             df = pd.DataFrame(columns=["timestamp", "isbn", "book_title", "title", "source", "price", "url", "notes"])
-            return df
+            return None, df
+        with prices_load_lock:
+            return version, _load_prices_cached(*version)
     except Exception as e:
         logger.error(f"Error loading prices data: {e}")
-        return pd.DataFrame(columns=["timestamp", "isbn", "book_title", "title", "source", "price", "url", "notes"])
+        return None, pd.DataFrame(columns=["timestamp", "isbn", "book_title", "title", "source", "price", "url", "notes"])
+
+
+def load_prices_data():
+    """Load prices data from CSV file (read-only, see prices_snapshot)"""
+    return prices_snapshot()[1]
+
+
+def isbn_row_index(version, df):
+    """Map each ISBN to its row positions in a prices DataFrame from prices_snapshot"""
+    return _ISBN_ROWS_CACHE.get(version, lambda: df.groupby("isbn", sort=False).indices)
+
+
+def _latest_rows(rows, keys, timestamps):
+    """Pick the most recent row of each key group (the first one wins on ties)
+
+    ``timestamps`` holds the parsed timestamps for ``rows``; rows without a
+    timestamp or with a missing key are skipped.
+    """
+    usable = (timestamps.notna() & rows[keys].notna().all(axis=1)).to_numpy()
+    rows, timestamps = rows[usable], timestamps[usable]
+    if NUMBA_AVAILABLE and not rows.empty:
+        group_codes = rows.groupby(keys, sort=False).ngroup().to_numpy(np.int64)
+        ts = timestamps.to_numpy("datetime64[ns]").view("int64")
+        best = latest_per_group(ts, group_codes, int(group_codes.max()) + 1)
+        return rows.iloc[best]
+    return rows.loc[timestamps.groupby([rows[key] for key in keys], sort=False).idxmax()]
+
+
+def _text_column(values):
+    """Convert a column to strings, with missing values as empty strings"""
+    return values.astype(str).where(values.notna(), "")
+
+
+def _price_records(rows, success):
+    """Build JSON-ready price records for a subset of the prices DataFrame"""
+    price = rows["price"]
+    records = pd.DataFrame(
+        {
+            "source": _text_column(rows["source"]),
+            "price": price.astype(object).where(price > 0, None),
+            "url": _text_column(rows["url"]),
+            "timestamp": _text_column(rows["timestamp"]),
+            "success": success,
+            "notes": _text_column(rows["notes"]),
+        }
+    )
+    return records.to_dict("records")
+
+
+def _latest_valid_prices(df):
+    """Most recent successful, priced record per (isbn, source), newest first"""
+    latest = df.sort_values("timestamp", ascending=False, kind="mergesort").drop_duplicates(
+        subset=["isbn", "source"], keep="first"
+    )
+    return latest[latest["price"].notna() & latest["success"]]
+
+
+def _isbn_price_stats(valid_latest):
+    """Current min/max/avg/count per ISBN, aggregated in a single grouped pass"""
+    stats = valid_latest.groupby("isbn", sort=False)["price"].agg(
+        min_price="min", max_price="max", avg_price="mean", price_count="count"
+    )
+    return stats.to_dict("index")
+
+
+def _write_file_atomic(path, data):
+    """Replace a file's contents via a uniquely named temp file in the same directory
+
+    Concurrent writers each get their own temp file, so os.replace always
+    swaps in a complete file and a failed write leaves the original intact.
+    """
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as tmp:
+        tmp_path = tmp.name
+        try:
+            tmp.write(data)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp_path)
+            raise
+    try:
+        # Keep the permissions of the file being replaced (temp files are created 0600)
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_file_bytes(path):
+    """Read a whole file with a single unbuffered read instead of the BufferedReader stack"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(size, 1))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=1)
+def _load_books_cached(mtime_ns, size):
+    """Parse books.json once per modification time and size"""
+    return orjson.loads(_read_file_bytes(BASE_DIR / "books.json"))
+
+
+@lru_cache(maxsize=1)
+def _load_grades_cached(mtime_ns, size):
+    """Parse grades.json once per modification time and size"""
+    return orjson.loads(_read_file_bytes(GRADES_FILE))
+
+
+def google_books_client():
+    """Google Books client for the current thread, so its HTTP session and connections are reused"""
+    client = getattr(_GOOGLE_BOOKS_CLIENTS, "client", None)
+    if client is None:
+        client = _GOOGLE_BOOKS_CLIENTS.client = GoogleBooksAPI()
+    return client
 
 
 def create_sample_data():
@@ -80,6 +334,7 @@ def create_sample_data():
                 "price": 42.50,
                 "url": "https://christianbook.com/...",
                 "notes": "Sample data",
+                "success": True,
             },
         ]
         df = pd.DataFrame(sample_data)
@@ -91,12 +346,13 @@ def create_sample_data():
 def index():
     """Main dashboard showing price data"""
     try:
-        df = load_prices_data()
+        prices_version, df = prices_snapshot()
 
         # Get latest prices for each ISBN/source combination
         if not df.empty:
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            latest_prices = df.sort_values("timestamp").groupby(["isbn", "source"]).tail(1)
+            # Convert on a new frame so the shared cached prices stay untouched
+            df = df.assign(timestamp=pd.to_datetime(df["timestamp"]))
+            latest_prices = _latest_rows(df, ["isbn", "source"], df["timestamp"])
 
             # Convert to dict for template
             prices_data = latest_prices.to_dict("records")
@@ -105,21 +361,21 @@ def index():
             charts = {}
             if CHARTS_AVAILABLE:
                 try:
-                    charts = generate_dashboard_charts(df)
+                    # Rebuild only when prices.csv changed
+                    charts = _CHARTS_CACHE.get(prices_version, lambda: generate_dashboard_charts(df))
                 except Exception as e:
                     logger.error(f"Error generating charts: {e}")
         else:
             prices_data = []
             charts = {}
 
-        books_file = BASE_DIR / "books.json"
-        books = json.loads(books_file.read_bytes()) if books_file.exists() else {}
+        books = shared_books()
 
         return render_template(
             "index.html",
             prices=prices_data,
             books=books,
-            total_records=len(df) if not df.empty else 0,
+            total_records=len(df),
             charts=charts,
         )
 
@@ -135,7 +391,9 @@ def api_prices():
     """API endpoint to get prices data as JSON"""
     try:
         df = load_prices_data()
-        return jsonify(df.to_dict("records"))
+        # Serialize straight from the frame with pandas' C encoder rather than
+        # boxing every cell into per-row dicts first
+        return Response(df.to_json(orient="records", double_precision=15), mimetype="application/json")
     except Exception as e:
         logger.error(f"Error in API prices endpoint: {e}")
         return jsonify({"error": str(e)}), 500
@@ -145,8 +403,9 @@ def api_prices():
 def api_prices_by_isbn(isbn):
     """API endpoint to get prices for a specific ISBN"""
     try:
-        df = load_prices_data()
-        isbn_data = df[df["isbn"] == isbn]
+        prices_version, df = prices_snapshot()
+        rows = isbn_row_index(prices_version, df).get(isbn)
+        isbn_data = df.iloc[rows] if rows is not None else df.iloc[:0]
         return jsonify(isbn_data.to_dict("records"))
     except Exception as e:
         logger.error(f"Error getting prices for ISBN {isbn}: {e}")
@@ -156,12 +415,15 @@ def api_prices_by_isbn(isbn):
 @app.route("/health")
 def health():
     """Health check endpoint"""
+    # One stat of prices.csv answers both whether it exists and which cached parse to count
+    prices_version, df = prices_snapshot()
+
     return jsonify(
         {
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
-            "csv_exists": PRICES_CSV.exists(),
-            "total_records": len(load_prices_data()) if PRICES_CSV.exists() else 0,
+            "csv_exists": prices_version is not None,
+            "total_records": len(df),
         }
     )
 
@@ -176,9 +438,7 @@ def admin():
 def get_books():
     """Return all tracked books with their ISBN metadata"""
     try:
-        books_file = BASE_DIR / "books.json"
-        books = json.loads(books_file.read_bytes()) if books_file.exists() else {}
-        return jsonify(books)
+        return jsonify(shared_books())
     except Exception as e:
         logger.error(f"Error loading books: {e}")
         return jsonify({"error": str(e)}), 500
@@ -188,7 +448,6 @@ def get_books():
 def add_book_isbn():
     """Add a new ISBN under a book title or update icon_url if patch_icon is set"""
     try:
-        from scripts.google_books_api import GoogleBooksAPI
         data = request.json or {}
         title = data.get("title", "").strip()
         isbn_input = data.get("isbn", "").strip()
@@ -198,7 +457,7 @@ def add_book_isbn():
         grade = data.get("grade", "").strip()
 
         books_file = BASE_DIR / "books.json"
-        books = json.loads(books_file.read_bytes()) if books_file.exists() else {}
+        books = orjson.loads(books_file.read_bytes()) if books_file.exists() else {}
 
         if patch_icon and title and isbn_input and icon_url:
             # Only update icon_url for the given ISBN
@@ -210,46 +469,35 @@ def add_book_isbn():
                     updated = True
                     break
             if updated:
-                books_file.write_text(json.dumps(books, indent=4))
+                save_books(books)
                 logger.info(f"Updated icon_url for {isbn_input} under {title}")
                 return jsonify({"message": "Icon updated"})
             else:
                 return jsonify({"error": "ISBN not found for icon update"}), 404
 
-        books_file = BASE_DIR / "books.json"
-        books = json.loads(books_file.read_bytes()) if books_file.exists() else {}
-
         # Ensure book entry exists
         # If title is not provided, try to get it from Google Books metadata after processing ISBN
         # We'll set the title variable after fetching metadata if needed
         original_title = title  # Save what user provided
-        already_tracked = False
         isbn_list = books.setdefault(title, []) if title else None
-        for t, lst in books.items():
-            for item in lst:
-                if isbn_input in item:
-                    already_tracked = True
-                    break
-            if already_tracked:
-                break
-        if already_tracked:
+        tracked_title = isbn_title_index().get(isbn_input)
+        if tracked_title is not None:
             # Show which title the ISBN is tracked under
-            tracked_title = title or original_title or isbn_input or 'this book'
             return jsonify({"error": f"ISBN is already tracked in '{tracked_title}'!"}), 400
 
         isbn_dict = {}
         
-        # Helper function to process a single ISBN
-        async def process_isbn(isbn):
+        # Helper function to process a single ISBN (blocking Google Books lookups)
+        def process_isbn(isbn):
             result = {"isbn": isbn, "success": False, "error": None, "metadata": None}
-            clean_isbn = isbn.replace("-", "").replace(" ", "")
+            clean_isbn = isbn.translate(ISBN_SEPARATORS)
             if len(clean_isbn) not in [10, 13]:
                 result["error"] = "Invalid ISBN format"
                 return result
             if isbn in isbn_dict:
                 result["error"] = "ISBN already being tracked"
                 return result
-            google_books_api = GoogleBooksAPI()
+            google_books_api = google_books_client()
             metadata_result = {"success": False, "source": "manual"}
             if google_books_api.is_available():
                 logger.info(f"Fetching metadata for ISBN {isbn} from Google Books...")
@@ -262,9 +510,8 @@ def add_book_isbn():
                     # Try to fetch image from Google Books API directly
                     try:
                         # Use Google Books API to get volume info for this ISBN
-                        import requests
                         gb_url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{clean_isbn}"
-                        resp = requests.get(gb_url, timeout=10)
+                        resp = google_books_api.session.get(gb_url, timeout=10)
                         if resp.status_code == 200:
                             data = resp.json()
                             if data.get("totalItems", 0) > 0:
@@ -277,7 +524,6 @@ def add_book_isbn():
                                     
                                     # Download the icon and save locally
                                     try:
-                                        from scripts.image_downloader import download_googlebooks_icon
                                         download_result = download_googlebooks_icon(isbn, icon_url)
                                         if download_result["success"]:
                                             # Add the local path to the metadata
@@ -313,7 +559,7 @@ def add_book_isbn():
         added = 0
         if isbn_input or (title and author):
             if isbn_input:
-                result = asyncio.run(process_isbn(isbn_input))
+                result = process_isbn(isbn_input)
                 # If title was not provided, try to get it from metadata
                 if not original_title:
                     title_from_metadata = result["metadata"].get("title") if result["metadata"] else None
@@ -343,7 +589,7 @@ def add_book_isbn():
                 # Require author if adding by title only
                 if not author:
                     return jsonify({"error": "Author is required when adding by title"}), 400
-                google_books_api = GoogleBooksAPI()
+                google_books_api = google_books_client()
                 search_results = google_books_api.search_by_title_and_author(title, author=author, max_results=5)
                 if not search_results:
                     # Return structured response to trigger manual entry form
@@ -357,26 +603,33 @@ def add_book_isbn():
                             "grade": grade if grade else ""
                         }
                     }), 400
-                seen = set()
+                # ISBNs already under this title plus candidates queued so far
+                seen = {isbn for entry in isbn_list for isbn in entry}
+                candidates = []
                 for item in search_results:
                     isbn_candidate = item.get("isbn13") or item.get("isbn10")
                     if not isbn_candidate or isbn_candidate in seen:
                         continue
-                    if any(isbn_candidate in x for x in isbn_list):
-                        continue
-                    result = asyncio.run(process_isbn(isbn_candidate))
+                    candidates.append(isbn_candidate)
+                    seen.add(isbn_candidate)
+
+                # Look up all candidates concurrently in one event loop, running
+                # each blocking lookup in a worker thread
+                async def process_candidates():
+                    return await asyncio.gather(*(asyncio.to_thread(process_isbn, c) for c in candidates))
+
+                for isbn_candidate, result in zip(candidates, asyncio.run(process_candidates())):
                     if result["success"]:
                         isbn_list.append({isbn_candidate: result["metadata"]})
                         added += 1
-                    seen.add(isbn_candidate)
         if added:
-            books_file.write_text(json.dumps(books, indent=4))
+            save_books(books)
             logger.info(f"Added {added} ISBNs under {title}")
             # Assign to grade level if specified
             if grade:
                 try:
                     with grade_db_lock:
-                        grades = load_grades()
+                        grades = copy_grades(shared_grades())
                         if grade not in grades:
                             grades[grade] = []
                         if title not in grades[grade]:
@@ -408,7 +661,7 @@ def remove_isbn(title, isbn):
         if not books_file.exists():
             return jsonify({"error": "No books file found"}), 404
 
-        books = json.loads(books_file.read_bytes())
+        books = orjson.loads(books_file.read_bytes())
 
         if title not in books:
             return jsonify({"error": "Book title not found"}), 404
@@ -419,7 +672,7 @@ def remove_isbn(title, isbn):
             return jsonify({"error": "ISBN not found"}), 404
 
         books[title] = new_list
-        books_file.write_text(json.dumps(books, indent=4))
+        save_books(books)
 
         return jsonify({"message": f"ISBN {isbn} removed from {title}"})
 
@@ -441,16 +694,12 @@ def search_books():
         
         results = []
         
-        # Import Google Books API
-        try:
-            from scripts.google_books_api import GoogleBooksAPI
-            google_books_api = GoogleBooksAPI()
-        except ImportError:
-            return jsonify({"error": "Google Books API not available"}), 500
+        google_books_api = google_books_client()
         
-        if search_type == "isbn" or (search_type == "auto" and query.replace("-", "").replace(" ", "").isdigit()):
+        clean_query = query.translate(ISBN_SEPARATORS)
+        if search_type == "isbn" or (search_type == "auto" and clean_query.isdigit()):
             # Search by ISBN
-            clean_isbn = query.replace("-", "").replace(" ", "")
+            clean_isbn = clean_query
             if len(clean_isbn) in [10, 13]:
                 metadata = google_books_api.fetch_book_metadata(clean_isbn)
                 if metadata.get("success") and metadata.get("title"):
@@ -507,10 +756,8 @@ def search_books():
 def trigger_scrape(isbn):
     """Trigger scraping for a specific ISBN"""
     try:
-        from scripts.scraper import scrape_all_sources, save_results_to_csv
-
         # Load books file and locate metadata
-        books = json.loads((BASE_DIR / "books.json").read_bytes())
+        books = shared_books()
 
         isbn_item = None
         book_title = None
@@ -548,8 +795,6 @@ def trigger_scrape(isbn):
 async def trigger_bulk_scrape():
     """Trigger bulk scraping for all tracked ISBNs"""
     try:
-        from scripts.scraper import scrape_all_isbns, load_isbns_from_file
-
         # Get list of book/isbn tuples first
         isbns = load_isbns_from_file()
 
@@ -579,22 +824,8 @@ def get_recent_prices():
         # Sort by timestamp and get latest 20 records
         df_recent = df.sort_values("timestamp", ascending=False).head(20)
 
-        # Convert to list of dictionaries and replace np.nan with None
-        records = df_recent.to_dict("records")
-        # Replace np.nan with None recursively
-        import numpy as np
-        def clean_nans(obj):
-            if isinstance(obj, dict):
-                return {k: clean_nans(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [clean_nans(v) for v in obj]
-            elif isinstance(obj, float) and np.isnan(obj):
-                return None
-            else:
-                return obj
-        records = clean_nans(records)
-        
-        return jsonify(records)
+        # NaN values are serialized as null by the JSON provider
+        return jsonify(df_recent.to_dict("records"))
 
     except Exception as e:
         logger.error(f"Error loading recent prices: {e}")
@@ -607,430 +838,76 @@ def export_csv():
     try:
         df = load_prices_data()
 
-        output = io.StringIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
-
-        response = make_response(output.getvalue())
-        response.headers["Content-Type"] = "text/csv"
-        response.headers["Content-Disposition"] = (
-            f"attachment; filename=book_prices_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        # Stream the CSV in row chunks instead of buffering the whole file
+        def generate():
+            yield df.iloc[:0].to_csv(index=False)
+            for start in range(0, len(df), CSV_EXPORT_CHUNK_ROWS):
+                yield df.iloc[start:start + CSV_EXPORT_CHUNK_ROWS].to_csv(index=False, header=False)
+
+        return Response(
+            generate(),
+            mimetype="text/csv",
+            headers={
+                "Content-Disposition": (
+                    f"attachment; filename=book_prices_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                )
+            },
         )
-
-        return response
     except Exception as e:
         logger.error(f"Error exporting CSV: {e}")
         return jsonify({"error": str(e)}), 500
 
 
-def generate_html_price_report(data):
-    """Generate a self-contained HTML report from price data"""
+def iter_html_price_report(data):
+    """Stream a self-contained HTML report from price data"""
     
-    # Get current timestamp for report generation
-    report_timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-    
-    # Start building HTML
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Book Price Report - {datetime.now().strftime('%Y-%m-%d')}</title>
-    <style>
-        * {{
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background-color: #f8f9fa;
-            padding: 20px;
-        }}
-        
-        .container {{
-            max-width: 800px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            overflow: hidden;
-        }}
-        
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px 20px;
-            text-align: center;
-        }}
-        
-        .header h1 {{
-            font-size: 2.5em;
-            margin-bottom: 10px;
-            font-weight: 300;
-        }}
-        
-        .header p {{
-            opacity: 0.9;
-            font-size: 1.1em;
-        }}
-        
-        .content {{
-            padding: 20px;
-        }}
-        
-        .book-section {{
-            margin-bottom: 40px;
-            border-bottom: 2px solid #eee;
-            padding-bottom: 30px;
-        }}
-        
-        .book-section:last-child {{
-            border-bottom: none;
-            margin-bottom: 0;
-        }}
-        
-        .book-title {{
-            font-size: 1.8em;
-            font-weight: 600;
-            color: #2c3e50;
-            margin-bottom: 10px;
-            border-left: 4px solid #667eea;
-            padding-left: 15px;
-        }}
-        
-        .book-meta {{
-            color: #7f8c8d;
-            margin-bottom: 20px;
-            font-size: 0.9em;
-        }}
-        
-        .best-price {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            text-align: center;
-        }}
-        
-        .best-price h3 {{
-            margin-bottom: 10px;
-            font-size: 1.2em;
-        }}
-        
-        .best-price .price {{
-            font-size: 2.2em;
-            font-weight: bold;
-            margin-bottom: 10px;
-        }}
-        
-        .best-price .source {{
-            opacity: 0.9;
-            margin-bottom: 15px;
-        }}
-        
-        .best-price a {{
-            display: inline-block;
-            background: rgba(255, 255, 255, 0.2);
-            color: white;
-            padding: 12px 24px;
-            border-radius: 25px;
-            text-decoration: none;
-            font-weight: 500;
-            transition: all 0.3s ease;
-            border: 2px solid rgba(255, 255, 255, 0.3);
-        }}
-        
-        .best-price a:hover {{
-            background: rgba(255, 255, 255, 0.3);
-            transform: translateY(-2px);
-        }}
-        
-        .all-prices {{
-            margin-top: 20px;
-        }}
-        
-        .all-prices h4 {{
-            color: #34495e;
-            margin-bottom: 15px;
-            font-size: 1.1em;
-        }}
-        
-        .price-grid {{
-            display: grid;
-            gap: 12px;
-        }}
-        
-        .price-item {{
-            background: #f8f9fa;
-            border: 1px solid #e9ecef;
-            border-radius: 6px;
-            padding: 15px;
-            transition: all 0.3s ease;
-        }}
-        
-        .price-item:hover {{
-            background: #e9ecef;
-            border-color: #667eea;
-            transform: translateY(-1px);
-        }}
-        
-        .price-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 8px;
-        }}
-        
-        .source-name {{
-            font-weight: 600;
-            color: #2c3e50;
-        }}
-        
-        .price-value {{
-            font-size: 1.3em;
-            font-weight: bold;
-            color: #27ae60;
-        }}
-        
-        .price-link {{
-            display: inline-block;
-            color: #667eea;
-            text-decoration: none;
-            font-size: 0.9em;
-            margin-top: 5px;
-            padding: 6px 12px;
-            background: rgba(102, 126, 234, 0.1);
-            border-radius: 4px;
-            transition: all 0.3s ease;
-        }}
-        
-        .price-link:hover {{
-            background: rgba(102, 126, 234, 0.2);
-            color: #5a6cb8;
-        }}
-        
-        .no-price {{
-            color: #e74c3c;
-            font-style: italic;
-        }}
-        
-        .summary {{
-            background: #e8f4fd;
-            border-left: 4px solid #3498db;
-            padding: 20px;
-            margin-bottom: 30px;
-            border-radius: 0 6px 6px 0;
-        }}
-        
-        .summary h3 {{
-            color: #2c3e50;
-            margin-bottom: 10px;
-        }}
-        
-        .summary-stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 15px;
-            margin-top: 15px;
-        }}
-        
-        .stat-item {{
-            text-align: center;
-            padding: 10px;
-            background: white;
-            border-radius: 6px;
-        }}
-        
-        .stat-value {{
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #667eea;
-        }}
-        
-        .stat-label {{
-            color: #7f8c8d;
-            font-size: 0.9em;
-        }}
-        
-        .footer {{
-            text-align: center;
-            padding: 20px;
-            background: #f8f9fa;
-            color: #7f8c8d;
-            font-size: 0.9em;
-        }}
-        
-        @media (max-width: 600px) {{
-            body {{
-                padding: 10px;
-            }}
-            
-            .header h1 {{
-                font-size: 2em;
-            }}
-            
-            .book-title {{
-                font-size: 1.5em;
-            }}
-            
-            .best-price .price {{
-                font-size: 1.8em;
-            }}
-            
-            .summary-stats {{
-                grid-template-columns: repeat(2, 1fr);
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📚 Book Price Report</h1>
-            <p>Generated on {report_timestamp}</p>
-        </div>
-        
-        <div class="content">"""
+    # Flatten all price records into one frame so the summary and the
+    # latest-per-source reductions run in pandas instead of per-record loops
+    records = pd.DataFrame(
+        [{**price_record, "isbn": isbn} for isbn, book_data in data.items() for price_record in book_data['prices']],
+        columns=["isbn", "source", "price", "url", "timestamp", "success"],
+    )
+    successful = records[(records["success"] == "True") & records["price"].notna()]
     
     # Add summary statistics
     total_books = len(data)
-    total_sources = set()
-    all_prices = []
-    
-    for isbn_data in data.values():
-        for price_record in isbn_data['prices']:
-            if price_record.get('success') == 'True' and price_record.get('price'):
-                total_sources.add(price_record['source'])
-                all_prices.append(price_record['price'])
-    
-    avg_price = sum(all_prices) / len(all_prices) if all_prices else 0
-    min_price = min(all_prices) if all_prices else 0
-    max_price = max(all_prices) if all_prices else 0
+    priced = successful[successful["price"] != 0]
+    total_sources = priced["source"].nunique()
     
-    html_content += f"""
-            <div class="summary">
-                <h3>📊 Report Summary</h3>
-                <p>Latest pricing information for all tracked books</p>
-                <div class="summary-stats">
-                    <div class="stat-item">
-                        <div class="stat-value">{total_books}</div>
-                        <div class="stat-label">Books Tracked</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value">{len(total_sources)}</div>
-                        <div class="stat-label">Price Sources</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value">${avg_price:.2f}</div>
-                        <div class="stat-label">Average Price</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-value">${min_price:.2f} - ${max_price:.2f}</div>
-                        <div class="stat-label">Price Range</div>
-                    </div>
-                </div>
-            </div>"""
+    if not priced.empty:
+        price_stats = priced["price"].agg(["mean", "min", "max"])
+        avg_price, min_price, max_price = price_stats["mean"], price_stats["min"], price_stats["max"]
+    else:
+        avg_price = min_price = max_price = 0
     
-    # Process each book
-    for isbn, book_data in data.items():
-        title = html.escape(book_data['title'])
-        
-        # Get latest prices from each source (successful ones only)
-        latest_prices = []
-        for price_record in book_data['prices']:
-            if price_record.get('success') == 'True' and price_record.get('price') is not None:
-                latest_prices.append(price_record)
-        
-        # Sort by timestamp to get the most recent from each source
-        price_by_source = {}
-        for price in latest_prices:
-            source = price['source']
-            timestamp = price['timestamp']
-            if source not in price_by_source or timestamp > price_by_source[source]['timestamp']:
-                price_by_source[source] = price
-        
-        current_prices = list(price_by_source.values())
-        
-        # Find best price
-        best_price = None
-        if current_prices:
-            best_price = min(current_prices, key=lambda x: x['price'])
-        
-        html_content += f"""
-            <div class="book-section">
-                <h2 class="book-title">{title}</h2>
-                <div class="book-meta">
-                    ISBN: {html.escape(isbn)} • Last Updated: {book_data.get('latest_update', 'Unknown')}
-                </div>"""
-        
-        if best_price:
-            best_url = html.escape(best_price['url']) if best_price.get('url') else '#'
-            best_source = html.escape(best_price['source'])
-            
-            html_content += f"""
-                <div class="best-price">
-                    <h3>🏆 Best Price Found</h3>
-                    <div class="price">${best_price['price']:.2f}</div>
-                    <div class="source">from {best_source}</div>
-                    <a href="{best_url}" target="_blank">🛒 View Deal</a>
-                </div>"""
-        
-        if current_prices:
-            html_content += """
-                <div class="all-prices">
-                    <h4>💰 All Current Prices</h4>
-                    <div class="price-grid">"""
-            
-            # Sort prices by value
-            sorted_prices = sorted(current_prices, key=lambda x: x['price'])
-            
-            for price in sorted_prices:
-                source = html.escape(price['source'])
-                price_val = price['price']
-                url = html.escape(price.get('url', '')) if price.get('url') else '#'
-                
-                # Highlight if this is the best price
-                extra_class = ' style="border-color: #667eea; border-width: 2px;"' if price == best_price else ''
-                
-                html_content += f"""
-                        <div class="price-item"{extra_class}>
-                            <div class="price-header">
-                                <span class="source-name">{source}</span>
-                                <span class="price-value">${price_val:.2f}</span>
-                            </div>
-                            <a href="{url}" target="_blank" class="price-link">🔗 View on {source}</a>
-                        </div>"""
-            
-            html_content += """
-                    </div>
-                </div>"""
-        else:
-            html_content += """
-                <div class="all-prices">
-                    <p class="no-price">⚠️ No current pricing data available</p>
-                </div>"""
-        
-        html_content += """
-            </div>"""
+    # Most recent successful record from each source, grouped per ISBN
+    timestamps = pd.to_datetime(successful["timestamp"], format="ISO8601", errors="coerce")
+    latest = _latest_rows(successful, ["isbn", "source"], timestamps)
+    latest_by_isbn = {isbn: group.to_dict("records") for isbn, group in latest.groupby("isbn", sort=False)}
     
-    # Close HTML
-    html_content += """
-        </div>
-        
-        <div class="footer">
-            <p>📱 This report works on all devices • Generated by BooksFindr Price Tracker</p>
-            <p>Tap any "View Deal" or "View on [Source]" link to open the book's page</p>
-        </div>
-    </div>
-</body>
-</html>"""
+    # Latest successful price from each source per book, cheapest first
+    books = [
+        {
+            "isbn": isbn,
+            "title": book_data["title"],
+            "latest_update": book_data.get("latest_update"),
+            "prices": sorted(latest_by_isbn.get(isbn, []), key=itemgetter("price")),
+        }
+        for isbn, book_data in data.items()
+    ]
     
-    return html_content
+    now = datetime.now()
+    return stream_template(
+        "price_report.html",
+        report_date=now.strftime("%Y-%m-%d"),
+        report_timestamp=now.strftime("%B %d, %Y at %I:%M %p"),
+        total_books=total_books,
+        total_sources=total_sources,
+        avg_price=avg_price,
+        min_price=min_price,
+        max_price=max_price,
+        books=books,
+    )
 
 
 @app.route("/export/html")
@@ -1045,22 +922,16 @@ def export_html():
         # Process data for the report
         result = {}
         
-        for isbn in df["isbn"].unique():
-            isbn_data = df[df["isbn"] == isbn]
+        isbn_metadata = shared_books()
+        
+        for isbn, isbn_data in df.groupby("isbn", sort=False):
             
             # Get book title - prioritize ISBNdb metadata over price data
             title = "Unknown Title"
-            try:
-                isbn_metadata = json.loads((BASE_DIR / "books.json").read_bytes())
-                metadata = isbn_metadata.get(str(isbn))
-                if metadata and metadata.get("title"):
-                    title = str(metadata["title"])
-                else:
-                    price_title_data = isbn_data[isbn_data["title"].notna() & (isbn_data["title"] != "")]
-                    if len(price_title_data) > 0:
-                        title = str(price_title_data["title"].iloc[0])
-            except Exception as e:
-                logger.warning(f"Error getting title for {isbn}: {e}")
+            metadata = isbn_metadata.get(str(isbn))
+            if isinstance(metadata, dict) and metadata.get("title"):
+                title = str(metadata["title"])
+            else:
                 price_title_data = isbn_data[isbn_data["title"].notna() & (isbn_data["title"] != "")]
                 if len(price_title_data) > 0:
                     title = str(price_title_data["title"].iloc[0])
@@ -1071,31 +942,22 @@ def export_html():
                 "latest_update": str(isbn_data["timestamp"].max()) if not isbn_data["timestamp"].isna().all() else None,
                 "prices": [],
             }
-              # Add individual price records
-            for _, row in isbn_data.iterrows():
-                price_record = {
-                    "source": str(row["source"]) if pd.notna(row["source"]) else "",
-                    "price": float(row["price"]) if row["price"] and str(row["price"]).replace(".", "").isdigit() else None,
-                    "url": str(row["url"]) if pd.notna(row["url"]) else "",
-                    "timestamp": str(row["timestamp"]) if pd.notna(row["timestamp"]) else "",
-                    "success": "True" if row["success"] else "False",
-                }
-                isbn_stats["prices"].append(price_record)
+            # Add individual price records
+            isbn_stats["prices"] = _price_records(isbn_data, isbn_data["success"].map({True: "True", False: "False"}))
             
             result[str(isbn)] = isbn_stats
         
-        # Generate HTML report
-        html_content = generate_html_price_report(result)
-        
-        # Create response
-        response = make_response(html_content)
-        response.headers["Content-Type"] = "text/html; charset=utf-8"
-        response.headers["Content-Disposition"] = (
-            f"attachment; filename=book_price_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+        # Stream the HTML report as it renders instead of buffering the whole page
+        return Response(
+            iter_html_price_report(result),
+            mimetype="text/html",
+            headers={
+                "Content-Disposition": (
+                    f"attachment; filename=book_price_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+                )
+            },
         )
         
-        return response
-        
     except Exception as e:
         logger.error(f"Error generating HTML report: {e}")
         return jsonify({"error": str(e)}), 500
@@ -1111,23 +973,16 @@ def api_summary():
             return jsonify({"message": "No data available"})
 
         # Calculate statistics
-        price_data = df[df["price"].notna() & (df["price"] != "")]
+        price_data = df["price"].dropna()
 
         if not price_data.empty:
-            price_data["price"] = pd.to_numeric(price_data["price"], errors="coerce")
-            price_data = price_data[price_data["price"].notna()]
-
+            price_stats = price_data.agg(["min", "max", "mean", "median"])
             summary = {
                 "total_records": len(df),
                 "unique_books": df["isbn"].nunique(),
                 "unique_sources": df["source"].nunique(),
-                "price_stats": {
-                    "min": float(price_data["price"].min()) if not price_data.empty else 0,
-                    "max": float(price_data["price"].max()) if not price_data.empty else 0,
-                    "mean": float(price_data["price"].mean()) if not price_data.empty else 0,
-                    "median": float(price_data["price"].median()) if not price_data.empty else 0,
-                },
-                "success_rate": len(df[df["success"] == "True"]) / len(df) * 100 if len(df) > 0 else 0,
+                "price_stats": {stat: float(value) for stat, value in price_stats.items()},
+                "success_rate": float(df["success"].mean() * 100),
                 "last_updated": df["timestamp"].max() if "timestamp" in df.columns else None,
             }
         else:
@@ -1157,82 +1012,48 @@ def api_prices_by_isbn_grouped():
             return jsonify({"message": "No data available", "data": {}})        # Group by ISBN and calculate statistics
         result = {}
 
-        for isbn in df["isbn"].unique():
-            isbn_data = df[df["isbn"] == isbn]
-
-            # Get the most recent record for each source to calculate current min/max/avg prices
-            isbn_data_sorted = isbn_data.sort_values("timestamp", ascending=False)
-            latest_by_source = isbn_data_sorted.groupby("source").first().reset_index()            # Get valid prices from most recent records only (non-null, non-empty, successful)
-            valid_latest_prices = latest_by_source[
-                (latest_by_source["price"].notna()) & 
-                (latest_by_source["price"] != "") &
-                (latest_by_source["success"])
-            ]
-            
-            if not valid_latest_prices.empty:
-                valid_prices_numeric = pd.to_numeric(valid_latest_prices["price"], errors="coerce")
-                valid_prices_numeric = valid_prices_numeric[valid_prices_numeric.notna()]
-            else:
-                valid_prices_numeric = pd.Series([])# Get book title - prioritize ISBNdb metadata over price data
+        isbn_metadata = shared_books()
+
+        # Current min/max/avg prices come from the most recent record for each
+        # source, reduced for every ISBN at once
+        price_stats = _isbn_price_stats(_latest_valid_prices(df))
+
+        for isbn, isbn_data in df.groupby("isbn", sort=False):
+
+            # Get book title - prioritize ISBNdb metadata over price data
             title = "Unknown Title"
-            try:
-                # First try to get title from ISBNdb metadata
-                isbn_metadata = json.loads((BASE_DIR / "books.json").read_bytes())
-                metadata = isbn_metadata.get(str(isbn))
-                if metadata and metadata.get("title"):
-                    title = str(metadata["title"])
-                    logger.info(f"Using ISBNdb title for {isbn}: {title}")
-                else:
-                    # Fallback to title from price data
-                    price_title_data = isbn_data[isbn_data["title"].notna() & (isbn_data["title"] != "")]
-                    if len(price_title_data) > 0:
-                        title = str(price_title_data["title"].iloc[0])
-                        logger.info(f"Using price data title for {isbn}: {title}")
-                    else:
-                        logger.warning(f"No title found for {isbn}")
-            except Exception as e:
-                logger.warning(f"Error getting title for {isbn}: {e}")
+            # First try to get title from ISBNdb metadata
+            metadata = isbn_metadata.get(isbn)
+            if isinstance(metadata, dict) and metadata.get("title"):
+                title = str(metadata["title"])
+                logger.info(f"Using ISBNdb title for {isbn}: {title}")
+            else:
                 # Fallback to title from price data
                 price_title_data = isbn_data[isbn_data["title"].notna() & (isbn_data["title"] != "")]
                 if len(price_title_data) > 0:
-                    title = str(price_title_data["title"].iloc[0])  # Calculate statistics
+                    title = price_title_data["title"].iloc[0]
+                    logger.info(f"Using price data title for {isbn}: {title}")
+                else:
+                    logger.warning(f"No title found for {isbn}")
+            # Calculate statistics
             isbn_stats = {
-                "isbn": str(isbn),
-                "title": str(title),
-                "total_records": int(len(isbn_data)),
-                "successful_records": int(len(isbn_data[isbn_data["success"] == "True"])),
-                "sources": [str(source) for source in isbn_data["source"].unique().tolist()],
-                "latest_update": str(isbn_data["timestamp"].max()) if not isbn_data["timestamp"].isna().all() else None,
+                "isbn": isbn,
+                "title": title,
+                "total_records": len(isbn_data),
+                "successful_records": isbn_data["success"].sum(),
+                "sources": isbn_data["source"].unique().tolist(),
+                "latest_update": isbn_data["timestamp"].max() if not isbn_data["timestamp"].isna().all() else None,
                 "prices": [],
             }
 
-            if not valid_prices_numeric.empty:
-                isbn_stats.update(
-                    {
-                        "min_price": float(valid_prices_numeric.min()),
-                        "max_price": float(valid_prices_numeric.max()),
-                        "avg_price": float(valid_prices_numeric.mean()),
-                        "price_count": int(len(valid_prices_numeric)),
-                    }
-                )
-            else:
-                isbn_stats.update({"min_price": None, "max_price": None, "avg_price": None, "price_count": 0})
+            isbn_stats.update(
+                price_stats.get(isbn, {"min_price": None, "max_price": None, "avg_price": None, "price_count": 0})
+            )
 
             # Add individual price records
-            for _, row in isbn_data.iterrows():
-                price_record = {
-                    "source": str(row["source"]) if pd.notna(row["source"]) else "",
-                    "price": float(row["price"])
-                    if row["price"] and str(row["price"]).replace(".", "").isdigit()
-                    else None,
-                    "url": str(row["url"]) if pd.notna(row["url"]) else "",
-                    "timestamp": str(row["timestamp"]) if pd.notna(row["timestamp"]) else "",
-                    "success": str(row["success"]) if pd.notna(row["success"]) else "False",
-                    "notes": str(row["notes"]) if pd.notna(row["notes"]) else "",
-                }
-                isbn_stats["prices"].append(price_record)
+            isbn_stats["prices"] = _price_records(isbn_data, isbn_data["success"].map({True: "True", False: "False"}))
 
-            result[str(isbn)] = isbn_stats
+            result[isbn] = isbn_stats
 
         return jsonify({"data": result, "total_isbns": len(result)})
 
@@ -1245,78 +1066,56 @@ def api_prices_by_isbn_grouped():
 def api_prices_by_book_grouped():
     """API endpoint to get prices grouped by book title with ISBN breakdown"""
     try:
-        df = load_prices_data()
+        prices_version, df = prices_snapshot()
         
         if df.empty:
             return jsonify({"message": "No data available", "data": {}})
         
         # Load books configuration to map ISBNs to book titles
-        books_file = BASE_DIR / "books.json"
-        if not books_file.exists():
+        books_version, books_config = books_snapshot()
+        if books_version is None:
             return jsonify({"error": "Books configuration not found"}, 500)
         
-        books_config = json.loads(books_file.read_bytes())
+        # Every ISBN belonging to each book, cached alongside the books data
+        book_isbns_by_title = book_isbn_index(books_version, books_config)
         
-        # Create ISBN to book title mapping
-        isbn_to_book = {}
-        for book_title, isbn_list in books_config.items():
-            for isbn_item in isbn_list:
-                for isbn_key, metadata in isbn_item.items():
-                    # Map both the key ISBN and the ISBN13/ISBN10 from metadata
-                    isbn_to_book[isbn_key] = book_title
-                    if metadata.get('isbn13'):
-                        isbn_to_book[metadata['isbn13']] = book_title
-                    if metadata.get('isbn10'):
-                        isbn_to_book[metadata['isbn10']] = book_title
+        # Row positions for each ISBN, partitioned once per load of the data
+        isbn_rows = isbn_row_index(prices_version, df)
+        
+        # Flag successful rows with a price once; the per-book and per-ISBN
+        # slices below reuse it instead of rebuilding the mask each time
+        df = df.assign(_valid=df["price"].notna() & df["success"])
+        
+        # Most recent valid price per (isbn, source), plus per-ISBN stats over
+        # them, computed once for every book
+        latest_valid = _latest_valid_prices(df)
+        isbn_price_stats = _isbn_price_stats(latest_valid)
+        latest_valid_rows = latest_valid.groupby("isbn", sort=False).indices
         
         result = {}
         
         # Group by book title
         for book_title, isbn_list in books_config.items():
-            # Get all ISBNs for this book
-            book_isbns = []
-            for isbn_item in isbn_list:
-                for isbn_key, metadata in isbn_item.items():
-                    book_isbns.extend([isbn_key, metadata.get('isbn13'), metadata.get('isbn10')])
+            book_isbns = list(book_isbns_by_title[book_title])
             
-            # Remove None values and duplicates
-            book_isbns = list(set([isbn for isbn in book_isbns if isbn]))
-            
-            # Get data for all ISBNs belonging to this book
-            book_data = df[df["isbn"].isin(book_isbns)]
-            
-            if book_data.empty:
+            # Get data for all ISBNs belonging to this book, skipping titles
+            # with no price data before touching the DataFrame
+            present_isbns = [isbn for isbn in book_isbns if isbn in isbn_rows]
+            if not present_isbns:
                 continue
+            book_data = df.iloc[np.sort(np.concatenate([isbn_rows[isbn] for isbn in present_isbns]))]
             
-            # Get the most recent record for each source across all ISBNs
-            book_data_sorted = book_data.sort_values("timestamp", ascending=False)
-            latest_by_source_isbn = book_data_sorted.groupby(["source", "isbn"]).first().reset_index()
-            
-            # Get valid prices from most recent records
-            valid_latest_prices = latest_by_source_isbn[
-                (latest_by_source_isbn["price"].notna()) & 
-                (latest_by_source_isbn["price"] != "") &
-                (latest_by_source_isbn["success"])
-            ]
-            
-            if not valid_latest_prices.empty:
-                valid_prices_numeric = pd.to_numeric(valid_latest_prices["price"], errors="coerce")
-                valid_prices_numeric = valid_prices_numeric[valid_prices_numeric.notna()]
-            else:
-                valid_prices_numeric = pd.Series([])
+            # Get valid prices from the most recent record for each source across all ISBNs
+            # (sorted positions keep the newest-first order used for the best price tie-break)
+            latest_positions = [latest_valid_rows[isbn] for isbn in present_isbns if isbn in latest_valid_rows]
+            valid_latest_prices = (
+                latest_valid.iloc[np.sort(np.concatenate(latest_positions))] if latest_positions else latest_valid.iloc[:0]
+            )
+            valid_prices_numeric = valid_latest_prices["price"]
             
             # Calculate overall book statistics
-            all_prices_data = book_data[
-                (book_data["price"].notna()) & 
-                (book_data["price"] != "") &
-                (book_data["success"])
-            ]
-            
-            if not all_prices_data.empty:
-                all_prices_numeric = pd.to_numeric(all_prices_data["price"], errors="coerce")
-                all_prices_numeric = all_prices_numeric[all_prices_numeric.notna()]
-            else:
-                all_prices_numeric = pd.Series([])
+            all_prices_data = book_data[book_data["_valid"]]
+            all_prices_numeric = all_prices_data["price"]
             
             # Find historical lowest and highest prices
             lowest_price = None
@@ -1325,13 +1124,13 @@ def api_prices_by_book_grouped():
             highest_price_date = None
             
             if not all_prices_numeric.empty:
-                lowest_idx = all_prices_data.loc[all_prices_numeric.idxmin()]
-                highest_idx = all_prices_data.loc[all_prices_numeric.idxmax()]
+                prices = all_prices_numeric.to_numpy()
+                lowest_pos, highest_pos = int(prices.argmin()), int(prices.argmax())
                 
-                lowest_price = float(all_prices_numeric.min())
-                lowest_price_date = str(lowest_idx["timestamp"])
-                highest_price = float(all_prices_numeric.max())
-                highest_price_date = str(highest_idx["timestamp"])
+                lowest_price = prices[lowest_pos]
+                lowest_price_date = all_prices_data["timestamp"].iat[lowest_pos]
+                highest_price = prices[highest_pos]
+                highest_price_date = all_prices_data["timestamp"].iat[highest_pos]
             
             # Get book icon URL from the first ISBN that has one
             icon_url = None
@@ -1347,10 +1146,10 @@ def api_prices_by_book_grouped():
             book_stats = {
                 "title": book_title,
                 "isbns": book_isbns,
-                "total_records": int(len(book_data)),
-                "successful_records": int(len(book_data[book_data["success"]])),
-                "sources": [str(source) for source in book_data["source"].unique().tolist()],
-                "latest_update": str(book_data["timestamp"].max()) if not book_data["timestamp"].isna().all() else None,
+                "total_records": len(book_data),
+                "successful_records": book_data["success"].sum(),
+                "sources": book_data["source"].unique().tolist(),
+                "latest_update": book_data["timestamp"].max() if not book_data["timestamp"].isna().all() else None,
                 "icon_url": icon_url,
                 "isbn_details": {},
                 "lowest_price_ever": lowest_price,
@@ -1361,18 +1160,17 @@ def api_prices_by_book_grouped():
             
             # Current best price from most recent scrapes
             if not valid_prices_numeric.empty:
+                best_pos = int(valid_prices_numeric.to_numpy().argmin())
                 book_stats.update({
-                    "best_current_price": float(valid_prices_numeric.min()),
-                    "worst_current_price": float(valid_prices_numeric.max()),
-                    "avg_current_price": float(valid_prices_numeric.mean()),
-                    "current_price_count": int(len(valid_prices_numeric)),
+                    "best_current_price": valid_prices_numeric.iat[best_pos],
+                    "worst_current_price": valid_prices_numeric.max(),
+                    "avg_current_price": valid_prices_numeric.mean(),
+                    "current_price_count": len(valid_prices_numeric),
                 })
                 
                 # Find the URL for the best current price
-                best_price_record = valid_latest_prices[
-                    pd.to_numeric(valid_latest_prices["price"], errors="coerce") == valid_prices_numeric.min()
-                ].iloc[0]
-                book_stats["best_price_url"] = str(best_price_record["url"]) if pd.notna(best_price_record["url"]) else ""
+                best_price_url = valid_latest_prices["url"].iat[best_pos]
+                book_stats["best_price_url"] = str(best_price_url) if pd.notna(best_price_url) else ""
             else:
                 book_stats.update({
                     "best_current_price": None,
@@ -1383,64 +1181,30 @@ def api_prices_by_book_grouped():
                 })
             
             # Add individual ISBN details
-            for isbn in book_isbns:
-                isbn_data = book_data[book_data["isbn"] == isbn]
-                if isbn_data.empty:
-                    continue
-                  # Get most recent prices for this ISBN
-                isbn_sorted = isbn_data.sort_values("timestamp", ascending=False)
-                isbn_latest_by_source = isbn_sorted.groupby("source").first().reset_index()
-                
-                isbn_valid_prices = isbn_latest_by_source[
-                    (isbn_latest_by_source["price"].notna()) & 
-                    (isbn_latest_by_source["price"] != "") &
-                    (isbn_latest_by_source["success"])
-                ]
-                
-                if not isbn_valid_prices.empty:
-                    isbn_prices_numeric = pd.to_numeric(isbn_valid_prices["price"], errors="coerce")
-                    isbn_prices_numeric = isbn_prices_numeric[isbn_prices_numeric.notna()]
-                else:
-                    isbn_prices_numeric = pd.Series([])
-                  # Calculate ISBN statistics
+            for isbn in present_isbns:
+                isbn_data = df.iloc[isbn_rows[isbn]]
+
+                # Calculate ISBN statistics
                 isbn_stats = {
-                    "isbn": str(isbn),
-                    "total_records": int(len(isbn_data)),
-                    "successful_records": int(len(isbn_data[isbn_data["success"]])),
-                    "sources": [str(source) for source in isbn_data["source"].unique().tolist()],
-                    "latest_update": str(isbn_data["timestamp"].max()) if not isbn_data["timestamp"].isna().all() else None,
+                    "isbn": isbn,
+                    "total_records": len(isbn_data),
+                    "successful_records": isbn_data["success"].sum(),
+                    "sources": isbn_data["source"].unique().tolist(),
+                    "latest_update": isbn_data["timestamp"].max() if not isbn_data["timestamp"].isna().all() else None,
                     "prices": [],
                 }
                 
-                if not isbn_prices_numeric.empty:
-                    isbn_stats.update({
-                        "min_price": float(isbn_prices_numeric.min()),
-                        "max_price": float(isbn_prices_numeric.max()),
-                        "avg_price": float(isbn_prices_numeric.mean()),
-                        "price_count": int(len(isbn_prices_numeric)),
-                    })
-                else:
-                    isbn_stats.update({
-                        "min_price": None,
-                        "max_price": None,
-                        "avg_price": None,
-                        "price_count": 0
-                    })
-                  # Add price records for this ISBN
-                for _, row in isbn_data.iterrows():
-                    price_record = {
-                        "source": str(row["source"]) if pd.notna(row["source"]) else "",
-                        "price": float(row["price"])
-                        if row["price"] and str(row["price"]).replace(".", "").isdigit()
-                        else None,
-                        "url": str(row["url"]) if pd.notna(row["url"]) else "",
-                        "timestamp": str(row["timestamp"]) if pd.notna(row["timestamp"]) else "",
-                        "success": bool(row["success"]) if pd.notna(row["success"]) else False,
-                        "notes": str(row["notes"]) if pd.notna(row["notes"]) else "",
-                    }
-                    isbn_stats["prices"].append(price_record)
+                # Current prices for this ISBN, from the stats aggregated above
+                isbn_stats.update(isbn_price_stats.get(isbn, {
+                    "min_price": None,
+                    "max_price": None,
+                    "avg_price": None,
+                    "price_count": 0
+                }))
+                # Add price records for this ISBN
+                isbn_stats["prices"] = _price_records(isbn_data, isbn_data["success"])
                 
-                book_stats["isbn_details"][str(isbn)] = isbn_stats
+                book_stats["isbn_details"][isbn] = isbn_stats
             
             result[book_title] = book_stats
         
@@ -1451,184 +1215,193 @@ def api_prices_by_book_grouped():
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/api/dashboard-data")
-def api_dashboard_data():
-    """API endpoint that returns merged book, grade, and price data for dashboard optimization"""
-    try:
-        # Load all required data
-        books_data = load_books()  # { title: [ {isbn: {...meta}}, ... ] }
-        grades_data = load_grades()  # { grade: [title, ...] }
-        
-        # Load prices data using existing endpoint logic
-        df = load_prices_data()
-        if df.empty:
-            prices_data = {}
-        else:
-            import numpy as np
-            def clean_nans(obj):
-                if isinstance(obj, dict):
-                    return {k: clean_nans(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [clean_nans(v) for v in obj]
-                elif isinstance(obj, float) and np.isnan(obj):
-                    return None
-                else:
-                    return obj
-            # prices_data = clean_nans(df.to_dict(orient='records'))
-
-            # Group by book title and calculate statistics
-            prices_data = {}
-            for title, group in df.groupby('book_title'):
-                if not isinstance(title, str) and np.isnan(title):
-                    title = ""
-                group = clean_nans(group)
-                # Get successful records only
-                successful_records = group[group['price'].notna() & (group['price'] > 0)]
-                
-                # Calculate basic stats
-                stats = {
-                    'title': title,
-                    'total_records': len(group),
-                    'successful_records': len(successful_records),
-                    'current_price_count': 0,
-                    'avg_current_price': None,
-                    'best_current_price': None,
-                    'best_price_url': None,
-                    'sources': [],
-                    'isbns': group['isbn'].unique().tolist(),
-                    'isbn_details': {}
-                }
+def build_dashboard_data(books_data, grades_data, df):
+    """Merge book metadata, grade assignments and price statistics into the dashboard's books-by-grade data"""
+    if df.empty:
+        prices_data = {}
+    else:
+        # Successful (priced) records, filtered once and split by title
+        successful = df[df['price'] > 0]
+        successful_by_title = {title: rows for title, rows in successful.groupby('book_title', sort=False)}
+
+        # Latest successful price from each source for every book, reduced
+        # once up front and kept in source order for each title
+        priced = successful[successful['source'].notna()]
+        latest_priced = priced.sort_values('timestamp', ascending=False, kind='mergesort').drop_duplicates(
+            subset=['book_title', 'source'], keep='first'
+        ).sort_values(['book_title', 'source'], kind='mergesort')
+        latest_by_title = {title: rows for title, rows in latest_priced.groupby('book_title', sort=False)}
+
+        # Per (title, ISBN) record counts, price stats, sources and the ten
+        # most recent successful prices, each aggregated in one grouped pass
+        title_isbn = ['book_title', 'isbn']
+        isbn_record_counts = df.groupby(title_isbn, sort=False).size().to_dict()
+        isbn_price_stats = successful.groupby(title_isbn, sort=False)['price'].agg(
+            avg_price='mean', min_price='min', max_price='max', price_count='count'
+        ).to_dict('index')
+        isbn_sources = successful.groupby(title_isbn, sort=False)['source'].unique().to_dict()
+        recent = successful.groupby(title_isbn, sort=False).tail(10)
+        recent = recent.astype(object).where(recent.notna(), None)
+        isbn_recent_prices = {
+            key: rows.to_dict('records') for key, rows in recent.groupby(title_isbn, sort=False)
+        }
+
+        # Group by book title and calculate statistics
+        prices_data = {}
+        for title, group in df.groupby('book_title', sort=False):
+            if not isinstance(title, str) and np.isnan(title):
+                title = ""
+            # Get successful records only
+            successful_records = successful_by_title.get(title, successful.iloc[:0])
+            
+            # Calculate basic stats
+            stats = {
+                'title': title,
+                'total_records': len(group),
+                'successful_records': len(successful_records),
+                'current_price_count': 0,
+                'avg_current_price': None,
+                'best_current_price': None,
+                'best_price_url': None,
+                'sources': [],
+                'isbns': group['isbn'].fillna('').unique().tolist(),
+                'isbn_details': {}
+            }
+            
+            if not successful_records.empty:
+                # Get latest price from each source
+                latest_by_source = latest_by_title.get(title, successful_records.iloc[:0])
+                current_prices = latest_by_source['price'].tolist()
                 
-                if not successful_records.empty:
-                    # Get latest price from each source
-                    latest_by_source = successful_records.loc[successful_records.groupby('source')['timestamp'].idxmax()]
-                    current_prices = latest_by_source['price'].tolist()
+                if current_prices:
+                    stats['current_price_count'] = len(current_prices)
+                    stats['avg_current_price'] = sum(current_prices) / len(current_prices)
+                    stats['best_current_price'] = min(current_prices)
                     
-                    if current_prices:
-                        stats['current_price_count'] = len(current_prices)
-                        stats['avg_current_price'] = sum(current_prices) / len(current_prices)
-                        stats['best_current_price'] = min(current_prices)
-                        
-                        # Find best price URL
-                        best_price_row = latest_by_source[latest_by_source['price'] == stats['best_current_price']].iloc[0]
-                        stats['best_price_url'] = best_price_row.get('url', '')
-                        
-                        # Get sources
-                        stats['sources'] = latest_by_source['source'].tolist()
+                    # Find best price URL
+                    best_price_row = latest_by_source[latest_by_source['price'] == stats['best_current_price']].iloc[0]
+                    stats['best_price_url'] = best_price_row.get('url', '')
                     
-                    # Calculate historical stats
-                    all_prices = successful_records['price'].tolist()
-                    stats['lowest_price_ever'] = min(all_prices)
-                    stats['highest_price_ever'] = max(all_prices)
-                    
-                    # Get dates for min/max prices
-                    min_price_row = successful_records[successful_records['price'] == stats['lowest_price_ever']].iloc[0]
-                    max_price_row = successful_records[successful_records['price'] == stats['highest_price_ever']].iloc[0]
-                    stats['lowest_price_date'] = min_price_row['timestamp']
-                    stats['highest_price_date'] = max_price_row['timestamp']
+                    # Get sources
+                    stats['sources'] = latest_by_source['source'].tolist()
                 
-                # Build ISBN details
-                for isbn in stats['isbns']:
-                    isbn_records = group[group['isbn'] == isbn]
-                    isbn_successful = isbn_records[isbn_records['price'].notna() & (isbn_records['price'] > 0)]
-                    
-                    if not isinstance(isbn, str) and np.isnan(isbn):
-                        isbn = ""
-                    isbn_stats = {
-                        'isbn': isbn,
-                        'total_records': len(isbn_records),
-                        'successful_records': len(isbn_successful),
-                        'sources': [],
-                        'prices': []
-                    }
-                    
-                    if not isbn_successful.empty:
-                        isbn_stats['sources'] = isbn_successful['source'].unique().tolist()
-                        isbn_stats['avg_price'] = isbn_successful['price'].mean()
-                        isbn_stats['min_price'] = isbn_successful['price'].min()
-                        isbn_stats['max_price'] = isbn_successful['price'].max()
-                        isbn_stats['price_count'] = len(isbn_successful)
-                        
-                        # Get recent prices for this ISBN
-                        recent_prices = clean_nans(isbn_successful.tail(10).to_dict('records'))
-                        isbn_stats['prices'] = recent_prices
+                # Calculate historical stats and the dates they were seen
+                all_prices = successful_records['price'].to_numpy()
+                lowest_pos, highest_pos = int(all_prices.argmin()), int(all_prices.argmax())
+                stats['lowest_price_ever'] = all_prices[lowest_pos]
+                stats['highest_price_ever'] = all_prices[highest_pos]
+                stats['lowest_price_date'] = successful_records['timestamp'].iat[lowest_pos]
+                stats['highest_price_date'] = successful_records['timestamp'].iat[highest_pos]
+            
+            # Build ISBN details
+            for isbn in stats['isbns']:
+                key = (title, isbn)
+                price_stats = isbn_price_stats.get(key)
+                
+                isbn_stats = {
+                    'isbn': isbn,
+                    'total_records': isbn_record_counts.get(key, 0),
+                    'successful_records': price_stats['price_count'] if price_stats else 0,
+                    'sources': [],
+                    'prices': []
+                }
+                
+                if price_stats:
+                    isbn_stats['sources'] = isbn_sources[key].tolist()
+                    isbn_stats.update(price_stats)
                     
-                    stats['isbn_details'][isbn] = isbn_stats
+                    # Get recent prices for this ISBN
+                    isbn_stats['prices'] = isbn_recent_prices[key]
                 
-                prices_data[title] = stats
-          # Create reverse mapping from book title to grade
-        book_to_grade = {}
-        for grade_name, book_list in grades_data.items():
-            for book_title in book_list:
-                book_to_grade[book_title] = grade_name
-        
-        logger.info(f"Created book_to_grade mapping with {len(book_to_grade)} entries")
-        
-        # Debug: Check specific grades
-        debug_grades = ['Kindergarten', '4th Grade', '5th Grade', '6th Grade']
-        for grade in debug_grades:
-            books_in_grade = [title for title, g in book_to_grade.items() if g == grade]
-            logger.info(f"{grade}: {len(books_in_grade)} books mapped")
-        
-        # Merge all data and organize by grade
-        # Initialize with all grades from grades_data plus Unassigned
-        books_by_grade = {'Unassigned': []}
-        for grade_name in grades_data.keys():
-            books_by_grade[grade_name] = []
-        
-        merged_data = {
-            'books_by_grade': books_by_grade,
-            'total_books': 0,
-            'timestamp': datetime.now().isoformat()
+                stats['isbn_details'][isbn] = isbn_stats
+            
+            prices_data[title] = stats
+      # Create reverse mapping from book title to grade
+    book_to_grade = book_grade_index(grades_data)
+    
+    logger.info(f"Created book_to_grade mapping with {len(book_to_grade)} entries")
+    
+    # Debug: Check specific grades
+    debug_grades = ['Kindergarten', '4th Grade', '5th Grade', '6th Grade']
+    books_per_grade = Counter(book_to_grade.values())
+    for grade in debug_grades:
+        logger.info(f"{grade}: {books_per_grade[grade]} books mapped")
+    
+    # Merge all data and organize by grade
+    # Initialize with all grades from grades_data plus Unassigned
+    books_by_grade = {'Unassigned': []}
+    for grade_name in grades_data.keys():
+        books_by_grade[grade_name] = []
+    
+    merged_data = {
+        'books_by_grade': books_by_grade,
+        'total_books': 0,
+    }
+    
+    # Get all unique book titles
+    all_titles = set(books_data.keys()) | set(prices_data.keys())
+    
+    for title in all_titles:
+        # Get book metadata
+        book_meta = books_data.get(title, [])
+        # Get price data
+        book_price_data = prices_data.get(title, {})
+        
+        # Create merged book object
+        merged_book = {
+            'title': title,
+            'assigned_grade': book_to_grade.get(title, 'Unassigned'),
+            'isbns': [],
+            'authors': [],
+            'icon_url': '',
+            'icon_path': '',
+            **book_price_data  # Merge in all price statistics
         }
         
-        # Get all unique book titles
-        all_titles = set(books_data.keys()) | set(prices_data.keys())
-        
-        for title in all_titles:
-            # Get book metadata
-            book_meta = books_data.get(title, [])
-            # Get price data
-            book_price_data = prices_data.get(title, {})
-            
-            # Create merged book object
-            merged_book = {
-                'title': title,
-                'assigned_grade': book_to_grade.get(title, 'Unassigned'),
-                'isbns': [],
-                'authors': [],
-                'icon_url': '',
-                'icon_path': '',
-                **book_price_data  # Merge in all price statistics
-            }
+        # Add metadata from books.json
+        if book_meta:
+            merged_book['isbns'] = [next(iter(item)) for item in book_meta]
             
-            # Add metadata from books.json
+            # Get metadata from first ISBN
             if book_meta:
-                merged_book['isbns'] = [list(item.keys())[0] for item in book_meta]
-                
-                # Get metadata from first ISBN
-                if book_meta:
-                    first_isbn_key = list(book_meta[0].keys())[0]
-                    meta = book_meta[0][first_isbn_key]
-                    merged_book['authors'] = meta.get('authors', [])
-                    merged_book['icon_url'] = meta.get('icon_url', '')
-                    merged_book['icon_path'] = meta.get('icon_path', '')
-              # Add to appropriate grade
-            grade = merged_book['assigned_grade']
-            if grade in merged_data['books_by_grade']:
-                merged_data['books_by_grade'][grade].append(merged_book)
-                # Debug logging for problematic grades
-                if grade in ['Kindergarten', '4th Grade', '5th Grade', '6th Grade']:
-                    logger.info(f"Added book '{title}' to {grade}")
-            else:
-                merged_data['books_by_grade']['Unassigned'].append(merged_book)
-                logger.warning(f"Book '{title}' assigned to Unassigned because grade '{grade}' not found")
-            
-            merged_data['total_books'] += 1
+                first_isbn_key = next(iter(book_meta[0]))
+                meta = book_meta[0][first_isbn_key]
+                merged_book['authors'] = meta.get('authors', [])
+                merged_book['icon_url'] = meta.get('icon_url', '')
+                merged_book['icon_path'] = meta.get('icon_path', '')
+          # Add to appropriate grade
+        grade = merged_book['assigned_grade']
+        if grade in merged_data['books_by_grade']:
+            merged_data['books_by_grade'][grade].append(merged_book)
+            # Debug logging for problematic grades
+            if grade in ['Kindergarten', '4th Grade', '5th Grade', '6th Grade']:
+                logger.info(f"Added book '{title}' to {grade}")
+        else:
+            merged_data['books_by_grade']['Unassigned'].append(merged_book)
+            logger.warning(f"Book '{title}' assigned to Unassigned because grade '{grade}' not found")
+        
+        merged_data['total_books'] += 1
+    return merged_data
+
+
+@app.route("/api/dashboard-data")
+def api_dashboard_data():
+    """API endpoint that returns merged book, grade, and price data for dashboard optimization"""
+    try:
+        # Load all required data
+        books_version, books_data = books_snapshot()  # { title: [ {isbn: {...meta}}, ... ] }
+        grades_version, grades_data = grades_snapshot()  # { grade: [title, ...] }
+        prices_version, df = prices_snapshot()
+        
+        # Rebuild the merged data only when one of the source files changed
+        merged_data = _DASHBOARD_CACHE.get(
+            (books_version, grades_version, prices_version),
+            lambda: build_dashboard_data(books_data, grades_data, df),
+        )
         
         return jsonify({
             'success': True,
-            'data': merged_data
+            'data': {**merged_data, 'timestamp': datetime.now().isoformat()}
         })
         
     except Exception as e:
@@ -1644,7 +1417,6 @@ def api_dashboard_data():
 def get_isbn_images(isbn):
     """Get existing images for an ISBN"""
     try:
-        from scripts.image_downloader import get_existing_image_info
         images = get_existing_image_info(isbn)
         return jsonify({"isbn": isbn, "images": images})
     except Exception as e:
@@ -1656,15 +1428,16 @@ def get_isbn_images(isbn):
 def download_image_for_isbn(isbn, source):
     """Download image for ISBN from specific source"""
     try:
-        from scripts.image_downloader import download_image_for_isbn_source
-        
         # Get the URL for this ISBN and source from price data
-        df = load_prices_data()
+        prices_version, df = prices_snapshot()
         if df.empty:
             return jsonify({"error": "No price data available"}), 404
             
-        # Find the most recent successful record for this ISBN and source
-        isbn_source_data = df[(df["isbn"] == isbn) & (df["source"].str.lower() == source.lower())]
+        # Find the most recent successful record for this ISBN and source,
+        # lowercasing only the sources of this ISBN's rows
+        rows = isbn_row_index(prices_version, df).get(isbn)
+        isbn_data = df.iloc[rows] if rows is not None else df.iloc[:0]
+        isbn_source_data = isbn_data[isbn_data["source"].str.lower() == source.lower()]
         if isbn_source_data.empty:
             return jsonify({"error": f"No data found for ISBN {isbn} and source {source}"}), 404
             
@@ -1673,7 +1446,7 @@ def download_image_for_isbn(isbn, source):
         if recent_data.empty:
             return jsonify({"error": f"No URL found for ISBN {isbn} and source {source}"}), 404
             
-        latest_record = recent_data.sort_values("timestamp", ascending=False).iloc[0]
+        latest_record = recent_data.iloc[recent_data["timestamp"].argmax()]
         url = latest_record["url"]
         
         # Download the image
@@ -1699,8 +1472,6 @@ def download_image_for_isbn(isbn, source):
 def cleanup_images():
     """Clean up old image files"""
     try:
-        from scripts.image_downloader import cleanup_old_images
-        
         days_old = request.json.get("days_old", 30) if request.json else 30
         result = cleanup_old_images(days_old)
         
@@ -1722,31 +1493,103 @@ def cleanup_images():
 
 # --- Grade Level Book Grouping API ---
 
-# Helper to load grades.json
-def load_grades() -> dict[str, list[str]]:
-    if not GRADES_FILE.exists():
-        return {}
-    with open(GRADES_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+# Helper to read grades.json through the cache, along with the version token it was loaded at.
+# Callers must not modify the grades.
+def grades_snapshot() -> tuple[tuple[int, int] | None, dict[str, list[str]]]:
+    version = _file_version(GRADES_FILE)
+    if version is None:
+        return None, {}
+    return version, _load_grades_cached(*version)
+
+# Helper to read grades.json through the cache. Callers must not modify the result.
+def shared_grades() -> dict[str, list[str]]:
+    return grades_snapshot()[1]
+
+# Helper to copy a grades dict (e.g. from shared_grades) into one the caller is free to modify
+def copy_grades(src: dict[str, list[str]]) -> dict[str, list[str]]:
+    return {grade: list(titles) for grade, titles in src.items()}
 
-# Helper to save grades.json
+# Helper to save grades.json atomically, so a failed write never leaves a truncated file
 def save_grades(grades: dict[str, list[str]]):
-    with open(GRADES_FILE, "w", encoding="utf-8") as f:
-        json.dump(grades, f, indent=2)
+    _write_file_atomic(GRADES_FILE, orjson.dumps(grades, option=orjson.OPT_INDENT_2))
+    # A rewrite can land on the same mtime and size, so drop everything derived from the old file
+    _load_grades_cached.cache_clear()
+    _BOOK_GRADES_CACHE.clear()
+    _DASHBOARD_CACHE.clear()
+
+# Helper to map each book title to its assigned grade (the last grade listing it wins)
+def book_grade_index(grades: dict[str, list[str]]) -> dict[str, str]:
+    return {title: grade for grade, titles in grades.items() for title in titles}
+
+# Helper to map each book title to the grades that list it, for grades from grades_snapshot.
+# Rebuilt only when grades.json changes.
+def grades_by_book(version, grades: dict[str, list[str]]) -> dict[str, list[str]]:
+    def build():
+        index = {}
+        for grade, titles in grades.items():
+            for title in titles:
+                index.setdefault(title, []).append(grade)
+        return index
+    return _BOOK_GRADES_CACHE.get(version, build)
+
+# Helper to load books.json along with the version token it was loaded at, shared between
+# requests until the file changes. Callers must not modify the books; writers read their own
+# copy and use save_books.
+def books_snapshot():
+    version = _file_version(BASE_DIR / "books.json")
+    if version is None:
+        return None, {}
+    return version, _load_books_cached(*version)
+
+# Helper to read books.json through the cache (see books_snapshot). Callers must not modify the result.
+def shared_books():
+    return books_snapshot()[1]
+
+# Helper to save books.json atomically, so a failed write never leaves a truncated file
+def save_books(books):
+    _write_file_atomic(BASE_DIR / "books.json", json.dumps(books, indent=4).encode("utf-8"))
+    # A rewrite can land on the same mtime and size, so drop everything derived from the old file
+    _load_books_cached.cache_clear()
+    _ISBN_TITLE_CACHE.clear()
+    _BOOK_ISBNS_CACHE.clear()
+    _DASHBOARD_CACHE.clear()
+
+# Helper to map each tracked ISBN to its book title, rebuilt only when books.json changes.
+# An ISBN listed under several titles maps to the first one, as a scan of books.json would find.
+def isbn_title_index():
+    version, books = books_snapshot()
+    return _ISBN_TITLE_CACHE.get(
+        version,
+        lambda: {isbn: title for title, items in reversed(books.items()) for item in items for isbn in item},
+    )
+
 
-# Helper to load books.json
-def load_books():
-    books_file = BASE_DIR / "books.json"
-    if not books_file.exists():
-        return {}
-    with open(books_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+def book_isbn_index(version, books):
+    """Map each title in books to the set of its key, ISBN13 and ISBN10 values
+
+    An ISBN can be listed under more than one title, so every book keeps its
+    own set. ``version`` is the token books_snapshot returned with ``books``;
+    the index is rebuilt only when it changes.
+    """
+    return _BOOK_ISBNS_CACHE.get(
+        version,
+        lambda: {
+            title: {
+                isbn
+                for item in items
+                for isbn_key, metadata in item.items()
+                for isbn in (isbn_key, metadata.get("isbn13"), metadata.get("isbn10"))
+                if isbn
+            }
+            for title, items in books.items()
+        },
+    )
 
 @app.route("/api/grades", methods=["GET"])
 def get_grades():
     """Get all grade groupings"""
     try:
-        grades = load_grades()
+        grades = shared_grades()
         return jsonify(grades)
     except Exception as e:
         logger.error(f"Error loading grades: {e}")
@@ -1762,8 +1605,8 @@ def add_book_to_grade():
         if not grade or not book:
             return jsonify({"error": "Missing grade or book"}), 400
         with grade_db_lock:
-            grades = load_grades()
-            books = load_books()
+            grades = copy_grades(shared_grades())
+            books = shared_books()
             if book not in books:
                 return jsonify({"error": "Book not found in books.json"}), 404
             if grade not in grades:
@@ -1787,7 +1630,7 @@ def remove_book_from_grade():
         if not grade or not book:
             return jsonify({"error": "Missing grade or book"}), 400
         with grade_db_lock:
-            grades = load_grades()
+            grades = copy_grades(shared_grades())
             if grade not in grades or book not in grades[grade]:
                 return jsonify({"error": "Book not in grade"}), 404
             grades[grade].remove(book)
@@ -1806,14 +1649,13 @@ def remove_book_from_all_grades():
         if not book:
             return jsonify({"error": "Missing book"}), 400
         with grade_db_lock:
-            grades = load_grades()
-            found = False
-            for grade in grades:
-                if book in grades[grade]:
-                    grades[grade].remove(book)
-                    found = True
-            if not found:
+            grades_version, current = grades_snapshot()
+            book_grades = grades_by_book(grades_version, current).get(book)
+            if not book_grades:
                 return jsonify({"error": "Book not found in any grade"}), 404
+            grades = copy_grades(current)
+            for grade in book_grades:
+                grades[grade].remove(book)
             save_grades(grades)
         return jsonify({"message": f"Removed '{book}' from all grades"})
     except Exception as e:
@@ -1830,14 +1672,14 @@ def move_book_to_grade():
         if not grade or not book:
             return jsonify({"error": "Missing grade or book"}), 400
         with grade_db_lock:
-            grades = load_grades()
-            books = load_books()
+            grades_version, current = grades_snapshot()
+            grades = copy_grades(current)
+            books = shared_books()
             if book not in books:
                 return jsonify({"error": "Book not found in books.json"}), 404
             # Remove from all grades
-            for g in grades:
-                if book in grades[g]:
-                    grades[g].remove(book)
+            for g in grades_by_book(grades_version, current).get(book, []):
+                grades[g].remove(book)
             # Add to new grade
             if grade not in grades:
                 grades[grade] = []
@@ -1879,7 +1721,7 @@ def add_book_manual():
         # Clean and validate ISBNs
         clean_isbns = []
         for isbn in isbns:
-            isbn = isbn.strip().replace("-", "").replace(" ", "")
+            isbn = isbn.strip().translate(ISBN_SEPARATORS)
             if isbn and len(isbn) in [10, 13]:
                 clean_isbns.append(isbn)
             elif isbn:  # Non-empty but invalid
@@ -1894,14 +1736,14 @@ def add_book_manual():
             authors = [author.strip() for author in authors_str.split(",") if author.strip()]
 
         books_file = BASE_DIR / "books.json"
-        books = json.loads(books_file.read_bytes()) if books_file.exists() else {}
+        books = orjson.loads(books_file.read_bytes()) if books_file.exists() else {}
 
         # Check if any ISBN is already tracked
+        tracked_titles = isbn_title_index()
         for isbn in clean_isbns:
-            for book_title, isbn_list in books.items():
-                for item in isbn_list:
-                    if isbn in item:
-                        return jsonify({"error": f"ISBN {isbn} is already tracked under '{book_title}'"}), 400
+            tracked_title = tracked_titles.get(isbn)
+            if tracked_title is not None:
+                return jsonify({"error": f"ISBN {isbn} is already tracked under '{tracked_title}'"}), 400
 
         # Create book entry
         isbn_list = books.setdefault(title, [])            # Add each ISBN with the same metadata
@@ -1921,7 +1763,6 @@ def add_book_manual():
             # Download icon if URL is provided
             if icon_url:
                 try:
-                    from scripts.image_downloader import download_googlebooks_icon
                     download_result = download_googlebooks_icon(isbn, icon_url)
                     if download_result["success"]:
                         # Add the local path to the metadata
@@ -1933,14 +1774,14 @@ def add_book_manual():
             isbn_list.append({isbn: isbn_metadata})
 
         # Save to file
-        books_file.write_text(json.dumps(books, indent=4))
+        save_books(books)
         logger.info(f"Manually added '{title}' with {len(clean_isbns)} ISBN(s): {', '.join(clean_isbns)}")
 
         # Assign to grade level if specified
         if grade:
             try:
                 with grade_db_lock:
-                    grades = load_grades()
+                    grades = copy_grades(shared_grades())
                     if grade not in grades:
                         grades[grade] = []
                     if title not in grades[grade]:
@@ -1969,7 +1810,7 @@ def update_isbn_metadata(title, isbn):
         books_file = BASE_DIR / "books.json"
         if not books_file.exists():
             return jsonify({"error": "No books file found"}), 404
-        books = json.loads(books_file.read_bytes())
+        books = orjson.loads(books_file.read_bytes())
         if title not in books:
             return jsonify({"error": "Book title not found"}), 404
         isbn_list = books[title]
@@ -1989,7 +1830,7 @@ def update_isbn_metadata(title, isbn):
                 break
         if not found:
             return jsonify({"error": "ISBN not found"}), 404
-        books_file.write_text(json.dumps(books, indent=4))
+        save_books(books)
         return jsonify({"message": f"ISBN {isbn} updated for {title}"})
     except Exception as e:
         logger.error(f"Error updating ISBN: {e}")
@@ -2000,21 +1841,19 @@ def update_isbn_metadata(title, isbn):
 def download_all_icons():
     """Download all book icons from Google Books to local storage"""
     try:
-        from scripts.image_downloader import download_all_book_icons
-        
         # Load books data
         books_file = BASE_DIR / "books.json"
         if not books_file.exists():
             return jsonify({"error": "No books file found"}), 404
             
-        books = json.loads(books_file.read_bytes())
+        books = orjson.loads(books_file.read_bytes())
         
         # Download all icons
         result = download_all_book_icons(books)
         
         # Save updated book data with icon paths
         if result["success"] and (result["downloaded"] > 0 or result["already_local"] > 0):
-            books_file.write_text(json.dumps(books, indent=4))
+            save_books(books)
             logger.info(f"Updated books.json with local icon paths for {result['downloaded']} books")
         
         return jsonify({
@@ -2031,8 +1870,6 @@ def download_all_icons():
 def download_googlebooks_icon_api(isbn):
     """Download a Google Books icon from a URL"""
     try:
-        from scripts.image_downloader import download_googlebooks_icon
-        
         data = request.json or {}
         url = data.get("url", "")
         
@@ -2051,14 +1888,14 @@ def download_googlebooks_icon_api(isbn):
         # Update icon_path in books.json if download was successful
         books_file = BASE_DIR / "books.json"
         if books_file.exists():
-            books = json.loads(books_file.read_bytes())
+            books = orjson.loads(books_file.read_bytes())
             # Find the ISBN in the books data
             for title, isbn_list in books.items():
                 for item in isbn_list:
                     if isbn in item:
                         item[isbn]["icon_path"] = result["image_path"]
                         # Save the updated books data
-                        books_file.write_text(json.dumps(books, indent=4))
+                        save_books(books)
                         logger.info(f"Updated books.json with local icon path for ISBN {isbn}")
                         break
         
@@ -0,0 +1,31 @@
+"""
+Book Price Tracker - Numeric Kernels
+Numba-compiled reductions for the price report and dashboard
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def latest_per_group(timestamps, group_codes, n_groups):
+    """
+    Find the row holding the most recent timestamp in each group
+
+    Args:
+        timestamps: int64 array of timestamps (nanoseconds since epoch)
+        group_codes: int64 array of group codes in the range [0, n_groups)
+        n_groups: Number of distinct groups
+
+    Returns:
+        int64 array with the row position of the latest record per group
+        (the first one wins on ties)
+    """
+    best = np.full(n_groups, -1, np.int64)
+    best_ts = np.full(n_groups, np.iinfo(np.int64).min, np.int64)
+    for i in range(timestamps.size):
+        group = group_codes[i]
+        if best[group] == -1 or timestamps[i] > best_ts[group]:
+            best_ts[group] = timestamps[i]
+            best[group] = i
+    return best
@@ -6,6 +6,7 @@ Downloads book cover images from various sources
 import requests
 import asyncio
 import aiohttp
+import concurrent.futures
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -27,6 +28,7 @@ from selenium.webdriver.chrome.service import Service
 BASE_DIR = Path(__file__).parent.parent
 IMAGES_DIR = BASE_DIR / "static" / "images" / "books"
 TIMEOUT = 15
+MAX_CONCURRENT_ICON_DOWNLOADS = 8  # Icon downloads run in parallel threads
 
 # Ensure images directory exists
 IMAGES_DIR.mkdir(parents=True, exist_ok=True)
@@ -494,39 +496,52 @@ def download_all_book_icons(books_data: dict) -> Dict[str, Any]:
         "errors": []
     }
     
+    def download(isbn: str, icon_url: str) -> Dict[str, Any]:
+        scraper_logger.info(f"Downloading Google Books icon for ISBN {isbn}")
+        return download_googlebooks_icon(isbn, icon_url)
+    
     try:
-        # Iterate through all books
+        # Collect every ISBN entry that has a remote icon but no local copy yet
+        pending = []
         for title, isbn_list in books_data.items():
             result["total_books"] += 1
             
-            # Iterate through all ISBNs for this book
             for isbn_entry in isbn_list:
                 for isbn, metadata in isbn_entry.items():
                     result["total_isbns"] += 1
                     
-                    # Check if there's an icon URL to download
                     icon_url = metadata.get("icon_url", "")
                     if icon_url and not metadata.get("icon_path", ""):
-                        try:
-                            # Download the icon
-                            scraper_logger.info(f"Downloading Google Books icon for ISBN {isbn}")
-                            download_result = download_googlebooks_icon(isbn, icon_url)
-                            
-                            if download_result["success"]:
-                                # Update metadata with local path
-                                if download_result["error"] == "Image already exists":
-                                    result["already_local"] += 1
-                                else:
-                                    result["downloaded"] += 1
-                                
-                                # Store the local path in the metadata
-                                metadata["icon_path"] = download_result["image_path"]
-                            else:
-                                result["failed"] += 1
-                                result["errors"].append(f"Failed to download icon for ISBN {isbn}: {download_result.get('error', 'Unknown error')}")
-                        except Exception as e:
-                            result["failed"] += 1
-                            result["errors"].append(f"Error processing ISBN {isbn}: {str(e)}")
+                        pending.append((isbn, icon_url, metadata))
+        
+        # Download each ISBN's icon once, overlapping the network round trips
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ICON_DOWNLOADS) as executor:
+            futures = {}
+            for isbn, icon_url, _ in pending:
+                if isbn not in futures:
+                    futures[isbn] = executor.submit(download, isbn, icon_url)
+        
+        seen = set()
+        for isbn, _, metadata in pending:
+            try:
+                download_result = futures[isbn].result()
+                
+                if download_result["success"]:
+                    # An ISBN listed again reuses the icon the first entry fetched
+                    if download_result["error"] == "Image already exists" or isbn in seen:
+                        result["already_local"] += 1
+                    else:
+                        result["downloaded"] += 1
+                    
+                    # Store the local path in the metadata
+                    metadata["icon_path"] = download_result["image_path"]
+                else:
+                    result["failed"] += 1
+                    result["errors"].append(f"Failed to download icon for ISBN {isbn}: {download_result.get('error', 'Unknown error')}")
+            except Exception as e:
+                result["failed"] += 1
+                result["errors"].append(f"Error processing ISBN {isbn}: {str(e)}")
+            seen.add(isbn)
     
     except Exception as e:
         result["success"] = False
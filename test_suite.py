@@ -7,12 +7,15 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import sys
+import os
 import json
+import tempfile
 
 # Add the project root to the path
 sys.path.append(str(Path(__file__).parent))
 
 from scripts.logger import setup_logger
+import app
 from app import load_prices_data, create_sample_data
 
 
@@ -41,6 +44,102 @@ def test_data_loading():
     return True
 
 
+def test_prices_cache():
+    """Test that parsed prices are reused until the CSV changes"""
+    print("Testing prices cache...")
+
+    # Backup existing data
+    csv_path = Path("data/prices.csv")
+    backup_path = Path("data/prices_backup.csv")
+
+    if csv_path.exists():
+        csv_path.rename(backup_path)
+
+    try:
+        row = {
+            "timestamp": datetime.now().isoformat(),
+            "isbn": "9781234567890",
+            "title": "Test Book",
+            "source": "TestSource",
+            "price": 29.99,
+            "url": "https://test.com",
+            "notes": "Test entry",
+            "success": True,
+        }
+        pd.DataFrame([row]).to_csv(csv_path, index=False)
+
+        # Unchanged file returns the same parsed DataFrame
+        first = load_prices_data()
+        assert load_prices_data() is first
+        assert len(first) == 1
+
+        # Rewriting the file invalidates the cache
+        pd.DataFrame([row, {**row, "source": "OtherSource"}]).to_csv(csv_path, index=False)
+        second = load_prices_data()
+        assert second is not first
+        assert len(second) == 2
+        print("✓ Prices cache reused and invalidated correctly")
+
+    finally:
+        # Restore backup if it exists
+        if backup_path.exists():
+            if csv_path.exists():
+                csv_path.unlink()
+            backup_path.rename(csv_path)
+
+    return True
+
+
+def test_latest_rows():
+    """Test latest-per-group selection with missing keys and timestamps"""
+    print("Testing latest-per-group selection...")
+
+    rows = pd.DataFrame(
+        {
+            "isbn": ["9781234567890", "9781234567890", None, "9780987654321", "9780987654321", "9781111111111"],
+            "source": ["TestSource", "TestSource", "TestSource", None, "OtherSource", "TestSource"],
+            "timestamp": ["2024-01-01", "2024-02-01", "2024-05-01", "2024-06-01", "2024-03-01", None],
+        }
+    )
+    timestamps = pd.to_datetime(rows["timestamp"])
+
+    # The Numba kernel and the pandas fallback must skip the same rows
+    numba_available = app.NUMBA_AVAILABLE
+    try:
+        for use_numba in sorted({False, numba_available}):
+            app.NUMBA_AVAILABLE = use_numba
+            latest = app._latest_rows(rows, ["isbn", "source"], timestamps)
+            assert latest.index.tolist() == [1, 4], (use_numba, latest.index.tolist())
+    finally:
+        app.NUMBA_AVAILABLE = numba_available
+
+    print("✓ Latest rows picked with missing keys skipped")
+    return True
+
+
+def test_atomic_write():
+    """Test that JSON saves replace the file whole and keep its permissions"""
+    print("Testing atomic file writes...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        target = Path(tmp_dir) / "books.json"
+
+        # A new file is created readable
+        app._write_file_atomic(target, b'{"a": 1}')
+        assert json.loads(target.read_text()) == {"a": 1}
+
+        # Rewrites keep the existing permissions and leave no temp files behind
+        os.chmod(target, 0o640)
+        app._write_file_atomic(target, b'{"b": 2}')
+        assert json.loads(target.read_text()) == {"b": 2}
+        if os.name == "posix":
+            assert target.stat().st_mode & 0o777 == 0o640
+        assert [p.name for p in Path(tmp_dir).iterdir()] == ["books.json"]
+
+    print("✓ Files replaced atomically")
+    return True
+
+
 def test_sample_data_creation():
     """Test sample data creation"""
     print("Testing sample data creation...")
@@ -60,6 +159,11 @@ def test_sample_data_creation():
         df = pd.read_csv(csv_path)
         print(f"✓ Created sample data with {len(df)} records")
 
+        # The app loads the sample row as a successful price
+        loaded = load_prices_data()
+        assert len(loaded) == len(df) == 1
+        assert bool(loaded["success"].iloc[0])
+
     finally:
         # Restore backup if it exists
         if backup_path.exists():
@@ -174,6 +278,9 @@ def run_all_tests():
     tests = [
         test_logging,
         test_data_loading,
+        test_prices_cache,
+        test_latest_rows,
+        test_atomic_write,
         test_sample_data_creation,
         test_csv_operations,
         test_isbn_file_handling,